@@ -6,11 +6,14 @@ Mandatory Patch Summary:
 2. Symmetry: Enforce shared motor floor (remove hard-coded 'UP' fallback).
 3. Semantics: Implement Panic State Machine (record episodes, not steps).
 4. Hygiene: Unified obstacle semantics across BFS and Flood Fill.
-5. Reproducibility: Explicitly seed NumPy RNG.
+5. Reproducibility: Each game draws from a private random.Random(seed).
 """
 
+import functools
+import os
 import random
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 
 
@@ -36,107 +39,537 @@ class Config:
     RESCUE_WINDOW = 20
 
 
+# Risk constants read on every step, bound once: Config is never mutated
+# at runtime, and a module global is cheaper than a class attribute.
+_W_TOPO = Config.W_TOPO
+_W_GEOM = Config.W_GEOM
+_SVD_ENTROPY_SCALE = Config.SVD_ENTROPY_SCALE
+
+
+# --- Move tables ---
+# Actions are move indices k (0..3, None for no move) throughout: Algs, the
+# Numba kernels, SnakeGame and SnakeBatch all index these tables.
+MOVES_DX = (0, 0, -1, 1)
+MOVES_DY = (-1, 1, 0, 0)
+
+
+# --- Optional Numba kernels for the search hot path ---
+# The kernels work on packed indices (idx = y * w + x) over a flat uint8
+# occupancy grid, expand neighbors in move-index order (UP, DOWN, LEFT,
+# RIGHT) and leave `visited` all-zero on return. Without numba, Algs falls
+# back to the pure-Python search; results are identical either way.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+USE_NUMBA = njit is not None
+
+if USE_NUMBA:
+
+    @njit(inline="always")
+    def _neighbor(c, k, w, n):
+        """Cell one move k away from c on a w-wide, n-cell board, or -1."""
+        if k == 0:
+            return c - w if c >= w else -1
+        if k == 1:
+            return c + w if c < n - w else -1
+        if k == 2:
+            return c - 1 if c % w != 0 else -1
+        return c + 1 if c % w != w - 1 else -1
+
+    @njit(cache=True)
+    def _bfs_first_move(occ, visited, w, h, start, goal):
+        """Move index of the first step of a shortest path, or -1."""
+        n = w * h
+        q = np.empty(n, np.int32)
+        first = np.empty(n, np.int8)
+        q[0] = start
+        first[start] = -1
+        visited[start] = 1
+        head = 0
+        tail = 1
+        result = -1
+
+        while head < tail:
+            c = q[head]
+            head += 1
+            if c == goal:
+                result = first[c]
+                break
+
+            for k in range(4):
+                nb = _neighbor(c, k, w, n)
+                if nb >= 0 and occ[nb] == 0 and visited[nb] == 0:
+                    visited[nb] = 1
+                    first[nb] = k if first[c] < 0 else first[c]
+                    q[tail] = nb
+                    tail += 1
+
+        for i in range(tail):
+            visited[q[i]] = 0
+        return result
+
+    @njit(cache=True)
+    def _flood_into(occ, visited, w, h, start, q, tail, tag):
+        """Flood from `start`, tagging cells and appending them to q[tail:]."""
+        n = w * h
+        head = tail
+        q[tail] = start
+        visited[start] = tag
+        tail += 1
+
+        while head < tail:
+            c = q[head]
+            head += 1
+            for k in range(4):
+                nb = _neighbor(c, k, w, n)
+                if nb >= 0 and occ[nb] == 0 and visited[nb] == 0:
+                    visited[nb] = tag
+                    q[tail] = nb
+                    tail += 1
+        return tail
+
+    @njit(cache=True)
+    def _flood_count(occ, visited, w, h, start):
+        """Number of free cells reachable from `start` (inclusive)."""
+        q = np.empty(w * h, np.int32)
+        tail = _flood_into(occ, visited, w, h, start, q, 0, 1)
+        for i in range(tail):
+            visited[q[i]] = 0
+        return tail
+
+    @njit(cache=True)
+    def _reach_areas(occ, visited, w, h, start):
+        """
+        Reachable area behind each of the four moves from `start` (-1 where
+        the move is off-board or blocked). Each connected region is flooded
+        once: a neighbor already tagged k + 1 reuses move k's area.
+        """
+        n = w * h
+        q = np.empty(n, np.int32)
+        areas = np.full(4, -1, np.int32)
+        tail = 0
+        for k in range(4):
+            nb = _neighbor(start, k, w, n)
+            if nb < 0 or occ[nb] != 0:
+                continue
+            if visited[nb] != 0:
+                areas[k] = areas[visited[nb] - 1]
+            else:
+                mark = tail
+                tail = _flood_into(occ, visited, w, h, nb, q, tail, k + 1)
+                areas[k] = tail - mark
+
+        for i in range(tail):
+            visited[q[i]] = 0
+        return areas
+
+    # Compile (or load from cache) at import rather than mid-experiment.
+    _warm_occ = np.zeros(4, np.uint8)
+    _warm_vis = np.zeros(4, np.uint8)
+    _bfs_first_move(_warm_occ, _warm_vis, 2, 2, 0, 3)
+    _flood_count(_warm_occ, _warm_vis, 2, 2, 0)
+    _reach_areas(_warm_occ, _warm_vis, 2, 2, 0)
+    del _warm_occ, _warm_vis
+
+
 class Algs:
-    MOVES = [
-        ("UP", (0, -1)),
-        ("DOWN", (0, 1)),
-        ("LEFT", (-1, 0)),
-        ("RIGHT", (1, 0)),
-    ]
+    # Searches run on packed cell indices (idx = y * w + x) over flat grids.
+    # Per board shape we keep reusable occupancy/visited grids (uint8 arrays
+    # for the Numba kernels, plain lists for the Python BFS; the Python flood
+    # fill uses bitsets instead) plus a neighbor table:
+    # nbrs[idx] = ((k, n_idx), ...) for in-bounds neighbors, in move-index
+    # order.
+    # Invariant: occupancy and visited are all-False between calls.
+    _boards = {}
 
     @staticmethod
-    def bfs_path(start, goal, obstacles, w, h):
-        q = deque([(start, [])])
-        visited = {start}
-        obs_set = set(obstacles)
+    def _board(w, h):
+        board = Algs._boards.get((w, h))
+        if board is None:
+            nbrs = []
+            for idx in range(w * h):
+                x, y = idx % w, idx // w
+                nbrs.append(tuple(
+                    (k, (y + MOVES_DY[k]) * w + (x + MOVES_DX[k]))
+                    for k in range(4)
+                    if 0 <= x + MOVES_DX[k] < w and 0 <= y + MOVES_DY[k] < h
+                ))
+            if USE_NUMBA:
+                board = (
+                    np.zeros(w * h, np.uint8), np.zeros(w * h, np.uint8), nbrs
+                )
+            else:
+                board = ([False] * (w * h), [False] * (w * h), nbrs)
+            Algs._boards[(w, h)] = board
+        return board
+
+    @staticmethod
+    def _mark(grid, cells, value, w):
+        for x, y in cells:
+            grid[y * w + x] = value
+
+    @staticmethod
+    def _bfs_marked(start, goal, occ, visited, nbrs, w, h):
+        if USE_NUMBA:
+            k = int(_bfs_first_move(occ, visited, w, h, start, goal))
+            return k if k >= 0 else None
+
+        # Each frontier entry carries only the index of the move that left
+        # `start` (-1 for `start` itself); the full path is never needed.
+        q = deque([(start, -1)])
+        visited[start] = True
+        touched = [start]
+        result = -1
 
         while q:
-            (cx, cy), path = q.popleft()
-            if (cx, cy) == goal:
-                return path[0] if path else None
-
-            for m_name, (dx, dy) in Algs.MOVES:
-                nx, ny = cx + dx, cy + dy
-                if (
-                    0 <= nx < w and 0 <= ny < h
-                    and (nx, ny) not in obs_set
-                    and (nx, ny) not in visited
-                ):
-                    visited.add((nx, ny))
-                    q.append(((nx, ny), path + [m_name]))
-        return None
+            c, first_move = q.popleft()
+            if c == goal:
+                result = first_move
+                break
+
+            for k, n in nbrs[c]:
+                if not occ[n] and not visited[n]:
+                    visited[n] = True
+                    touched.append(n)
+                    q.append((n, k if first_move < 0 else first_move))
+
+        for c in touched:
+            visited[c] = False
+        return result if result >= 0 else None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _bit_masks(w, h):
+        """(all cells, all but column 0, all but column w-1) as bitmasks."""
+        full = (1 << (w * h)) - 1
+        left_col = sum(1 << (y * w) for y in range(h))
+        right_col = left_col << (w - 1)
+        return full, full & ~left_col, full & ~right_col
+
+    @staticmethod
+    def _free_bits(obstacles, w, h):
+        occ = 0
+        for x, y in obstacles:
+            occ |= 1 << (y * w + x)
+        return Algs._bit_masks(w, h)[0] & ~occ
+
+    @staticmethod
+    def _flood_seen(start, free, w, h):
+        # Bitset flood fill: bit idx stands for cell idx, and each iteration
+        # grows the whole frontier by one ring with a few big-int ops.
+        # Column masks stop +-1 shifts from wrapping across rows.
+        _, not_left, not_right = Algs._bit_masks(w, h)
+        seen = frontier = 1 << start
+        while frontier:
+            frontier = (
+                (frontier << w) | (frontier >> w)
+                | ((frontier << 1) & not_left)
+                | ((frontier >> 1) & not_right)
+            ) & free & ~seen
+            seen |= frontier
+        return seen
+
+    @staticmethod
+    def bfs_path(start, goal, obstacles, w, h):
+        occ, visited, nbrs = Algs._board(w, h)
+        Algs._mark(occ, obstacles, True, w)
+        try:
+            return Algs._bfs_marked(
+                start[1] * w + start[0], goal[1] * w + goal[0],
+                occ, visited, nbrs, w, h,
+            )
+        finally:
+            Algs._mark(occ, obstacles, False, w)
 
     @staticmethod
     def flood_fill_count(start, obstacles, w, h):
-        q = deque([start])
-        visited = {start}
-        obs_set = set(obstacles)
-        count = 0
+        s = start[1] * w + start[0]
+        if not USE_NUMBA:
+            seen = Algs._flood_seen(s, Algs._free_bits(obstacles, w, h), w, h)
+            return bin(seen).count("1")
 
-        while q:
-            cx, cy = q.popleft()
-            count += 1
-            for _, (dx, dy) in Algs.MOVES:
-                nx, ny = cx + dx, cy + dy
-                if (
-                    0 <= nx < w and 0 <= ny < h
-                    and (nx, ny) not in obs_set
-                    and (nx, ny) not in visited
-                ):
-                    visited.add((nx, ny))
-                    q.append((nx, ny))
-        return count
+        occ, visited, _ = Algs._board(w, h)
+        Algs._mark(occ, obstacles, True, w)
+        try:
+            return int(_flood_count(occ, visited, w, h, s))
+        finally:
+            Algs._mark(occ, obstacles, False, w)
 
     @staticmethod
     def get_max_reach_move(head, obstacles, w, h):
         best_move = None
         max_area = -1
         hx, hy = head
-
-        for m_name, (dx, dy) in Algs.MOVES:
-            nx, ny = hx + dx, hy + dy
-            if 0 <= nx < w and 0 <= ny < h and (nx, ny) not in set(obstacles):
-                area = Algs.flood_fill_count((nx, ny), obstacles, w, h)
-                if area > max_area:
-                    max_area = area
-                    best_move = m_name
+        occ, visited, nbrs = Algs._board(w, h)
+
+        # Build the occupancy once for all four candidates, and flood each
+        # connected region once: neighbors that share a region share its area.
+        if USE_NUMBA:
+            Algs._mark(occ, obstacles, True, w)
+            try:
+                reach = _reach_areas(occ, visited, w, h, hy * w + hx)
+            finally:
+                Algs._mark(occ, obstacles, False, w)
+            areas = [(k, int(a)) for k, a in enumerate(reach) if a >= 0]
+        else:
+            free = Algs._free_bits(obstacles, w, h)
+            regions = []  # (seen bitset, area) per region flooded so far
+            areas = []
+            for k, n in nbrs[hy * w + hx]:
+                if not free >> n & 1:
+                    continue
+                for seen, area in regions:
+                    if seen >> n & 1:
+                        break
+                else:
+                    seen = Algs._flood_seen(n, free, w, h)
+                    area = bin(seen).count("1")
+                    regions.append((seen, area))
+                areas.append((k, area))
+
+        for k, area in areas:
+            if area > max_area:
+                max_area = area
+                best_move = k
         return best_move
 
 
 class StructGate:
+    # Risk of a body = W_TOPO * topo + W_GEOM * geom (0 under 3 cells), with
+    # topo = 1 - (area flooded from the head) / (body length) and
+    # geom = 1 - SVD_ENTROPY_SCALE * s2 / s1, both clipped to [0, 1];
+    # s1 >= s2 are the singular values of the centered body coordinates.
+
     @staticmethod
-    def analyze_risk(snake_body, w, h):
-        if len(snake_body) < 3:
-            return 0.0
+    def _topo_risk(snake_body, w, h):
+        area = Algs.flood_fill_count(snake_body[0], snake_body, w, h)
+        return np.clip(1.0 - (area / max(1, len(snake_body))), 0.0, 1.0)
 
-        pts = np.array(snake_body)
-        pts = pts - np.mean(pts, axis=0)
+    @staticmethod
+    def geom_risk_from_moments(n, sx, sy, sxx, syy, sxy):
+        """
+        Geometric risk from body coordinate moments, without an SVD.
+
+        The squared singular values of the centered body are the eigenvalues
+        of its 2x2 scatter matrix. With n-scaled integer moments they follow
+        in closed form; lam2 = det / lam1 avoids cancellation for near-straight
+        bodies. Body cells are distinct, so lam1 > 0 for n >= 2. Accepts
+        scalars or (B,) arrays.
+        """
+        a = n * sxx - sx * sx
+        d = n * syy - sy * sy
+        b = n * sxy - sx * sy
+        lam1 = ((a + d) + np.sqrt((a - d) ** 2 + 4.0 * b * b)) / 2.0
+        lam2 = (a * d - b * b) / lam1
+        entropy = np.sqrt(np.maximum(lam2, 0.0) / n) / (np.sqrt(lam1 / n) + 1e-8)
+        return np.clip(1.0 - entropy * _SVD_ENTROPY_SCALE, 0.0, 1.0)
 
-        try:
-            _, s, _ = np.linalg.svd(pts, full_matrices=False)
-            entropy = s[1] / (s[0] + 1e-8) if len(s) >= 2 else 0.0
-            geom_risk = np.clip(
-                1.0 - entropy * Config.SVD_ENTROPY_SCALE, 0.0, 1.0
-            )
-        except Exception:
-            geom_risk = 0.0
+    @staticmethod
+    def analyze_risk_incremental(snake_body, moments, w, h):
+        """Risk of one body, with its moments tracked by BodyMoments."""
+        if len(snake_body) < 3:
+            return 0.0
 
-        area = Algs.flood_fill_count(snake_body[0], snake_body, w, h)
-        topo_risk = np.clip(
-            1.0 - (area / max(1, len(snake_body))), 0.0, 1.0
+        m = moments
+        geom_risk = StructGate.geom_risk_from_moments(
+            m.n, m.sx, m.sy, m.sxx, m.syy, m.sxy
         )
+        topo_risk = StructGate._topo_risk(snake_body, w, h)
+
+        return _W_TOPO * topo_risk + _W_GEOM * geom_risk
 
-        return Config.W_TOPO * topo_risk + Config.W_GEOM * geom_risk
+    @staticmethod
+    def analyze_risk_batch(snake_bodies, w, h, moments=None):
+        """
+        Risk of many bodies at once, as an array aligned with `snake_bodies`.
+
+        The geometric term is evaluated for the whole batch from coordinate
+        moments: `moments` = (n, sx, sy, sxx, syy, sxy) arrays aligned with
+        `snake_bodies` if the caller tracks them (SnakeBatch does), else
+        summed here over the zero-padded (B, L, 2) stack. The topological
+        term still uses the per-body flood fill.
+        """
+        risks = np.zeros(len(snake_bodies))
+        rows = [i for i, body in enumerate(snake_bodies) if len(body) >= 3]
+        if not rows:
+            return risks
+
+        if moments is None:
+            lens = np.array([len(snake_bodies[i]) for i in rows])
+            pts = np.zeros((len(rows), lens.max(), 2), dtype=np.int64)
+            for j, i in enumerate(rows):
+                pts[j, :lens[j]] = snake_bodies[i]
+            x, y = pts[:, :, 0], pts[:, :, 1]
+            moments = (
+                lens, x.sum(axis=1), y.sum(axis=1),
+                (x * x).sum(axis=1), (y * y).sum(axis=1), (x * y).sum(axis=1),
+            )
+        else:
+            moments = tuple(np.asarray(m)[rows] for m in moments)
+
+        geom = StructGate.geom_risk_from_moments(*moments)
+        topo = np.array([
+            StructGate._topo_risk(snake_bodies[i], w, h) for i in rows
+        ])
+        risks[rows] = _W_TOPO * topo + _W_GEOM * geom
+        return risks
+
+
+class BodyMoments:
+    """
+    Running coordinate moments (n, sx, sy, sxx, syy, sxy) of a snake body.
+
+    sync() applies the step's delta in O(1) (head entered, tail left when
+    the snake did not grow) and rebuilds from scratch on anything else.
+    Integer sums stay exact, so nothing drifts over an episode.
+    """
+
+    def __init__(self):
+        self.reset(())
+
+    def reset(self, body):
+        self.n = len(body)
+        self.sx = sum(x for x, _ in body)
+        self.sy = sum(y for _, y in body)
+        self.sxx = sum(x * x for x, _ in body)
+        self.syy = sum(y * y for _, y in body)
+        self.sxy = sum(x * y for x, y in body)
+        self._head = body[0] if body else None
+        self._tail = body[-1] if body else None
+
+    def _add(self, p, sign):
+        x, y = p
+        self.sx += sign * x
+        self.sy += sign * y
+        self.sxx += sign * x * x
+        self.syy += sign * y * y
+        self.sxy += sign * x * y
+
+    def sync(self, snake):
+        n = len(snake)
+        head, tail = snake[0], snake[-1]
+        if n == self.n and head == self._head and tail == self._tail:
+            return
+        if n >= 2 and snake[1] == self._head and n in (self.n, self.n + 1):
+            self._add(head, 1)
+            if n == self.n:
+                self._add(self._tail, -1)
+            self.n, self._head, self._tail = n, head, tail
+        else:
+            self.reset(snake)
+
+
+class FreeCells:
+    """
+    Free board cells as packed indices (y * w + x) with O(1) add, remove
+    and uniform pick (swap-pop on an index list plus a slot table).
+    """
+
+    def __init__(self, n_cells):
+        self.cells = list(range(n_cells))
+        self.slot = list(range(n_cells))  # position in `cells`, -1 if occupied
+
+    def remove(self, idx):
+        i = self.slot[idx]
+        last = self.cells.pop()
+        if last != idx:
+            self.cells[i] = last
+            self.slot[last] = i
+        self.slot[idx] = -1
+
+    def add(self, idx):
+        self.slot[idx] = len(self.cells)
+        self.cells.append(idx)
+
+    def pick(self, rng):
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+def _draw_food(rng, is_occupied, free, w, h):
+    """
+    Food cell for one game: up to 100 uniform draws rejected while
+    is_occupied(x, y), then a uniform pick from the FreeCells `free`.
+    Shared by SnakeGame and SnakeBatch so both consume `rng` identically.
+    """
+    for _ in range(100):
+        x = rng.randrange(w)  # same draw as randint(0, w - 1)
+        y = rng.randrange(h)
+        if not is_occupied(x, y):
+            return (x, y)
+    # Crowded board: draw uniformly from the free cells rather than
+    # falling back to a fixed (0, 0). Rejection sampling stays first so
+    # the RNG stream (and every committed result) is unchanged.
+    if free.cells:
+        idx = free.pick(rng)
+        return (idx % w, idx // w)
+    return (0, 0)  # board full
+
+
+class SnakeBody:
+    """
+    Snake cells head-first in a fixed ring buffer (deque-compatible subset).
+
+    Capacity is one more than the board, since the head is pushed before
+    the tail pops. Cells stay (x, y) tuples so callers can hash them;
+    prefix() hands out the body as one or two C-level list slices.
+    """
+
+    __slots__ = ("_buf", "_cap", "_head", "_len")
+
+    def __init__(self, capacity, start):
+        self._buf = [None] * capacity
+        self._cap = capacity
+        self._head = 0
+        self._buf[0] = start
+        self._len = 1
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("snake index out of range")
+        return self._buf[(self._head + i) % self._cap]
+
+    def __iter__(self):
+        return iter(self.prefix(self._len))
+
+    def appendleft(self, cell):
+        self._head = (self._head - 1) % self._cap
+        self._buf[self._head] = cell
+        self._len += 1
+
+    def pop(self):
+        self._len -= 1
+        return self._buf[(self._head + self._len) % self._cap]
+
+    def prefix(self, n):
+        """First n cells (head first) as a tuple."""
+        start, end = self._head, self._head + n
+        if end <= self._cap:
+            return tuple(self._buf[start:end])
+        return tuple(self._buf[start:]) + tuple(self._buf[:end - self._cap])
 
 
 class SnakeGame:
     def __init__(self, seed):
-        random.seed(seed)
-        np.random.seed(seed)  # 🔒 Reproducibility fix
+        # 🔒 Reproducibility: a private RNG per game, never the global one,
+        # so games in separate worker processes cannot disturb each other.
+        # random.Random(seed) draws exactly what random.seed(seed) did.
+        # Games are not thread-safe: the Algs search grids are module-level.
+        self.rng = random.Random(seed)
 
         self.w = Config.GRID_W
         self.h = Config.GRID_H
-        self.snake = deque([(self.w // 2, self.h // 2)])
+        self._max_hunger = Config.MAX_STEPS_WITHOUT_FOOD
+        self.snake = SnakeBody(self.w * self.h + 1, (self.w // 2, self.h // 2))
+        self._body_set = set(self.snake)  # mirrors self.snake for O(1) lookups
+        self._free = FreeCells(self.w * self.h)
+        self._free.remove((self.h // 2) * self.w + self.w // 2)
         self.food = self._spawn_food()
         self.steps_since_food = 0
         self.steps_total = 0
@@ -144,13 +577,11 @@ class SnakeGame:
         self.death = "ALIVE"
 
     def _spawn_food(self):
-        occupied = set(self.snake)
-        for _ in range(100):
-            x = random.randint(0, self.w - 1)
-            y = random.randint(0, self.h - 1)
-            if (x, y) not in occupied:
-                return (x, y)
-        return (0, 0)
+        occupied = self._body_set
+        return _draw_food(
+            self.rng, lambda x, y: (x, y) in occupied, self._free,
+            self.w, self.h,
+        )
 
     def step(self, action):
         if self.done:
@@ -160,145 +591,310 @@ class SnakeGame:
         self.steps_since_food += 1
 
         hx, hy = self.snake[0]
-        dx, dy = 0, 0
-
-        if action == "UP":
-            dy = -1
-        elif action == "DOWN":
-            dy = 1
-        elif action == "LEFT":
-            dx = -1
-        elif action == "RIGHT":
-            dx = 1
-
-        nx, ny = hx + dx, hy + dy
+        if action is None:  # no move found: zero displacement
+            nx, ny = hx, hy
+        else:
+            nx, ny = hx + MOVES_DX[action], hy + MOVES_DY[action]
 
-        if not (0 <= nx < self.w and 0 <= ny < self.h) or (nx, ny) in list(self.snake)[:-1]:
+        # The tail moves away this step, so it is not an obstacle.
+        if not (0 <= nx < self.w and 0 <= ny < self.h) or (
+            (nx, ny) in self._body_set and (nx, ny) != self.snake[-1]
+        ):
             self.done = True
             self.death = "Collision"
             return
 
         self.snake.appendleft((nx, ny))
+        if (nx, ny) not in self._body_set:  # else: the old tail's cell
+            self._free.remove(ny * self.w + nx)
+        self._body_set.add((nx, ny))
 
         if (nx, ny) == self.food:
             self.steps_since_food = 0
             self.food = self._spawn_food()
         else:
-            self.snake.pop()
+            tail = self.snake.pop()
+            if tail != (nx, ny):  # head may have moved into the old tail cell
+                self._body_set.discard(tail)
+                self._free.add(tail[1] * self.w + tail[0])
 
-        if self.steps_since_food >= Config.MAX_STEPS_WITHOUT_FOOD:
+        if self.steps_since_food >= self._max_hunger:
             self.done = True
             self.death = "Starvation"
 
 
+class SnakeBatch:
+    """
+    N independent Snake games stepped in lockstep (struct-of-arrays).
+
+    Game i reproduces SnakeGame(seeds[i]) exactly: food is drawn from a
+    per-game random.Random(seed), the same stream SnakeGame.rng yields.
+    Head/tail/food/counters live in (N,) arrays and the collision test is
+    one occupancy lookup across all games; the SnakeBody rings are kept per
+    game because the agents' BFS reads them.
+    """
+
+    DX = np.array(MOVES_DX + (0,))  # index 4: no move (None action)
+    DY = np.array(MOVES_DY + (0,))
+
+    def __init__(self, seeds):
+        n = len(seeds)
+        self.n = n
+        self.w = Config.GRID_W
+        self.h = Config.GRID_H
+        self._rngs = [random.Random(seed) for seed in seeds]
+        # Per-game free-cell lists, updated in the same order as SnakeGame's
+        # so the crowded-board food fallback picks identically.
+        self._free = [FreeCells(self.w * self.h) for _ in range(n)]
+
+        start = (self.w // 2, self.h // 2)
+        self.snakes = [SnakeBody(self.w * self.h + 1, start) for _ in range(n)]
+        self.occ = np.zeros((n, self.w, self.h), dtype=bool)
+        self.occ[:, start[0], start[1]] = True
+        for free in self._free:
+            free.remove(start[1] * self.w + start[0])
+        self.heads = np.tile(np.array(start, dtype=np.int16), (n, 1))
+        self.tails = self.heads.copy()
+        # Body coordinate moments (n, sx, sy, sxx, syy, sxy), kept exact
+        # in int64 so the batched risk needs no per-body pass.
+        x0, y0 = start
+        self._mom = np.tile(
+            np.array([1, x0, y0, x0 * x0, y0 * y0, x0 * y0], dtype=np.int64),
+            (n, 1),
+        )
+        self.foods = np.array(
+            [self._spawn_food(i) for i in range(n)], dtype=np.int16
+        )
+        self.steps_since_food = np.zeros(n, dtype=np.int32)
+        self.steps_total = np.zeros(n, dtype=np.int32)
+        self.alive = np.ones(n, dtype=bool)
+        self.deaths = ["ALIVE"] * n
+
+    def _spawn_food(self, i):
+        occupied = self.occ[i]
+        return _draw_food(
+            self._rngs[i], lambda x, y: occupied[x, y], self._free[i],
+            self.w, self.h,
+        )
+
+    @staticmethod
+    def _point_moments(x, y):
+        x = x.astype(np.int64)
+        y = y.astype(np.int64)
+        return np.stack(
+            [np.ones_like(x), x, y, x * x, y * y, x * y], axis=1
+        )
+
+    def view(self, i):
+        return _SnakeView(self, i)
+
+    def moments(self, idx):
+        """Moment columns for games `idx`, as accepted by analyze_risk_batch."""
+        return tuple(self._mom[idx].T)
+
+    def active(self):
+        """Indices of games that still take steps."""
+        return np.flatnonzero(
+            self.alive & (self.steps_total < Config.MAX_TOTAL_STEPS)
+        )
+
+    def step(self, idx, actions):
+        """Advance games `idx` (ascending) by one step with `actions`."""
+        k = np.array([4 if a is None else a for a in actions])
+        self.steps_total[idx] += 1
+        self.steps_since_food[idx] += 1
+
+        nx = self.heads[idx, 0] + self.DX[k]
+        ny = self.heads[idx, 1] + self.DY[k]
+        in_bounds = (0 <= nx) & (nx < self.w) & (0 <= ny) & (ny < self.h)
+        hit_body = self.occ[
+            idx, np.clip(nx, 0, self.w - 1), np.clip(ny, 0, self.h - 1)
+        ]
+        # The tail moves away this step, so it is not an obstacle.
+        on_tail = (nx == self.tails[idx, 0]) & (ny == self.tails[idx, 1])
+        crashed = ~in_bounds | (hit_body & ~on_tail)
+
+        for i in idx[crashed]:
+            self.alive[i] = False
+            self.deaths[i] = "Collision"
+
+        ok = ~crashed
+        idx, nx, ny = idx[ok], nx[ok], ny[ok]
+        ate = (nx == self.foods[idx, 0]) & (ny == self.foods[idx, 1])
+
+        self.occ[idx, nx, ny] = True
+        self.heads[idx, 0] = nx
+        self.heads[idx, 1] = ny
+        self._mom[idx] += self._point_moments(nx, ny)
+
+        # Non-eaters drop their tail, unless the head moved onto it.
+        moved = ~ate
+        mi, mx, my = idx[moved], nx[moved], ny[moved]
+        tx, ty = self.tails[mi, 0], self.tails[mi, 1]
+        drop = (tx != mx) | (ty != my)
+        self.occ[mi[drop], tx[drop], ty[drop]] = False
+        # Head-onto-tail nets to zero here, matching the unchanged cell set.
+        self._mom[mi] -= self._point_moments(tx, ty)
+
+        for i, x, y, grew in zip(
+            idx.tolist(), nx.tolist(), ny.tolist(), ate.tolist()
+        ):
+            snake = self.snakes[i]
+            free = self._free[i]
+            tail = snake[-1]
+            snake.appendleft((x, y))
+            if (x, y) != tail:  # else: the head took over the old tail's cell
+                free.remove(y * self.w + x)
+            if grew:
+                self.steps_since_food[i] = 0
+                self.foods[i] = self._spawn_food(i)
+            else:
+                snake.pop()
+                if (x, y) != tail:
+                    free.add(tail[1] * self.w + tail[0])
+            self.tails[i] = snake[-1]
+
+        starved = idx[self.steps_since_food[idx] >= Config.MAX_STEPS_WITHOUT_FOOD]
+        for i in starved:
+            self.alive[i] = False
+            self.deaths[i] = "Starvation"
+
+
+class _SnakeView:
+    """Read-only SnakeGame-shaped view of one game in a SnakeBatch."""
+
+    def __init__(self, batch, i):
+        self._batch = batch
+        self._i = i
+        self.w = batch.w
+        self.h = batch.h
+
+    @property
+    def snake(self):
+        return self._batch.snakes[self._i]
+
+    @property
+    def food(self):
+        x, y = self._batch.foods[self._i]
+        return (int(x), int(y))
+
+    @property
+    def steps_since_food(self):
+        return int(self._batch.steps_since_food[self._i])
+
+    @property
+    def steps_total(self):
+        return int(self._batch.steps_total[self._i])
+
+
 class BaseAgent:
     def __init__(self, is_coase=False):
         self.is_coase = is_coase
         self.panic_history = []
         self.in_panic = False
+        self._moments = BodyMoments()
+        # Per-step constants, bound once per agent.
+        self._risk_base = Config.RISK_THRESHOLD_BASE
+        self._hunger_gain = Config.RISK_HUNGER_GAIN
+        self._max_hunger = Config.MAX_STEPS_WITHOUT_FOOD
+
+    def _effective_threshold(self, hunger_ratio):
+        """Panic threshold for the current hunger; subclasses reprice it."""
+        return self._risk_base + hunger_ratio * self._hunger_gain
+
+    def get_action(self, game, risk=None):
+        # `risk` may be precomputed by a batched caller (analyze_risk_batch).
+        snake = game.snake
+        w, h = game.w, game.h
+        head = snake[0]
+        # The one copy per step: the searches mark this body (minus the tail,
+        # which moves away) into the shared occupancy grid and unmark it after.
+        body_no_tail = snake.prefix(len(snake) - 1)
+
+        # Decide the mode first so only the search that is used gets run.
+        panic = False
+        if self.is_coase:
+            if risk is None:
+                self._moments.sync(snake)
+                risk = StructGate.analyze_risk_incremental(
+                    body_no_tail + (snake[-1],), self._moments, w, h
+                )
+            hunger_ratio = min(1.0, game.steps_since_food / self._max_hunger)
+            panic = risk >= self._effective_threshold(hunger_ratio)
 
-    def get_action(self, game):
-        state = {
-            "snake": list(game.snake),
-            "food": game.food,
-            "w": game.w,
-            "h": game.h,
-            "hunger": game.steps_since_food,
-        }
+        if panic:
+            if not self.in_panic:
+                self.panic_history.append(game.steps_total)
+                self.in_panic = True
 
-        head = state["snake"][0]
-        body_no_tail = state["snake"][:-1]
+            action = Algs.bfs_path(head, snake[-1], body_no_tail, w, h)
+        else:
+            self.in_panic = False
+            action = Algs.bfs_path(head, game.food, body_no_tail, w, h)
 
-        action = Algs.bfs_path(
-            head, state["food"], body_no_tail, state["w"], state["h"]
-        )
+        # Motor floor: no path to the goal, take the roomiest move.
+        if action is None:
+            action = Algs.get_max_reach_move(head, body_no_tail, w, h)
 
-        if self.is_coase:
-            risk = StructGate.analyze_risk(
-                state["snake"], state["w"], state["h"]
-            )
-            hunger_ratio = min(
-                1.0, state["hunger"] / Config.MAX_STEPS_WITHOUT_FOOD
-            )
-            threshold = (
-                Config.RISK_THRESHOLD_BASE
-                + hunger_ratio * Config.RISK_HUNGER_GAIN
-            )
+        return action
 
-            if risk >= threshold:
-                if not self.in_panic:
-                    self.panic_history.append(game.steps_total)
-                    self.in_panic = True
 
-                tail = state["snake"][-1]
-                escape_move = Algs.bfs_path(
-                    head, tail, body_no_tail, state["w"], state["h"]
-                )
-                if escape_move:
-                    action = escape_move
-                else:
-                    action = Algs.get_max_reach_move(
-                        head, body_no_tail, state["w"], state["h"]
-                    )
-            else:
-                self.in_panic = False
+def _run_one(args):
+    """One (agent, seed) episode; top-level so worker processes can pickle it."""
+    is_coase, seed = args
+    game = SnakeGame(seed)
+    agent = BaseAgent(is_coase=is_coase)
+    max_steps = Config.MAX_TOTAL_STEPS
 
-        if not action:
-            action = Algs.get_max_reach_move(
-                head, body_no_tail, state["w"], state["h"]
-            )
+    while not game.done and game.steps_total < max_steps:
+        action = agent.get_action(game)
+        game.step(action)
 
-        return action
+    rescue_count = sum(
+        1
+        for p in agent.panic_history
+        if game.steps_total - p >= Config.RESCUE_WINDOW
+    )
+
+    return {
+        "steps": game.steps_total,
+        "len": len(game.snake),
+        "death": game.death,
+        "panics": len(agent.panic_history),
+        "rescues": rescue_count,
+    }
 
 
 def run_experiment():
     print("Snake-SHM v0.3.2: Final Engineering Consistency Check")
 
     results = {"Greedy": [], "Coase": []}
-
-    for name, is_coase in [("Greedy", False), ("Coase", True)]:
-        for seed in range(
-            Config.SEED_START, Config.SEED_START + Config.N_SEEDS
-        ):
-            game = SnakeGame(seed)
-            agent = BaseAgent(is_coase=is_coase)
-
-            while not game.done and game.steps_total < Config.MAX_TOTAL_STEPS:
-                action = agent.get_action(game)
-                game.step(action)
-
-            rescue_count = sum(
-                1
-                for p in agent.panic_history
-                if game.steps_total - p >= Config.RESCUE_WINDOW
+    seeds = range(Config.SEED_START, Config.SEED_START + Config.N_SEEDS)
+
+    # Episodes are independent and seeded explicitly, so they run in worker
+    # processes; map() keeps seed order, matching a serial run.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for name, is_coase in [("Greedy", False), ("Coase", True)]:
+            results[name] = list(
+                executor.map(_run_one, [(is_coase, seed) for seed in seeds])
             )
 
-            results[name].append(
-                {
-                    "steps": game.steps_total,
-                    "len": len(game.snake),
-                    "death": game.death,
-                    "panics": len(agent.panic_history),
-                    "rescues": rescue_count,
-                }
+            res = results[name]
+            avg_steps = np.mean([r["steps"] for r in res])
+            avg_len = np.mean([r["len"] for r in res])
+            total_p = sum(r["panics"] for r in res)
+            total_r = sum(r["rescues"] for r in res)
+
+            print(f"\n=== Agent: {name} ===")
+            print(f"Survival Steps: {avg_steps:.1f} | Final Length: {avg_len:.2f}")
+            print(
+                f"Death Types: "
+                f"{ {d: [r['death'] for r in res].count(d) for d in set(r['death'] for r in res)} }"
             )
 
-        res = results[name]
-        avg_steps = np.mean([r["steps"] for r in res])
-        avg_len = np.mean([r["len"] for r in res])
-        total_p = sum(r["panics"] for r in res)
-        total_r = sum(r["rescues"] for r in res)
-
-        print(f"\n=== Agent: {name} ===")
-        print(f"Survival Steps: {avg_steps:.1f} | Final Length: {avg_len:.2f}")
-        print(
-            f"Death Types: "
-            f"{ {d: [r['death'] for r in res].count(d) for d in set(r['death'] for r in res)} }"
-        )
-
-        if is_coase:
-            rate = (total_r / total_p * 100) if total_p > 0 else 0
-            print(f"Rescue Rate (Episodes): {rate:.1f}% ({total_r}/{total_p})")
+            if is_coase:
+                rate = (total_r / total_p * 100) if total_p > 0 else 0
+                print(f"Rescue Rate (Episodes): {rate:.1f}% ({total_r}/{total_p})")
 
 
 if __name__ == "__main__":
@@ -13,6 +13,7 @@ Engineering fixes in this version:
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -33,7 +34,7 @@ if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
 # Explicitly importing from the frozen v0.3.2 engineering edition
-from snake_shm_v0_3_2 import Config, SnakeGame, BaseAgent, StructGate, Algs
+from snake_shm_v0_3_2 import Config, SnakeGame, SnakeBatch, BaseAgent, StructGate
 
 
 # --- 1) Define the Sweep Agent (Inheritance, NOT Rewrite) ---
@@ -47,61 +48,68 @@ class SweepAgent(BaseAgent):
         super().__init__(is_coase=True)  # Must be Coase to have pricing
         self.alpha = float(alpha)
         self.steps_in_panic = 0  # Metric: time spent in panic mode
+        self._effective_gain = Config.RISK_HUNGER_GAIN * self.alpha
 
-    def get_action(self, game: SnakeGame):
-        # --- Context Setup (Identical structure to BaseAgent) ---
-        state = {
-            "snake": list(game.snake),
-            "food": game.food,
-            "w": game.w,
-            "h": game.h,
-            "hunger": game.steps_since_food,
-        }
-        head = state["snake"][0]
-        body_no_tail = state["snake"][:-1]
-
-        # System 1: Default Greedy (Identical)
-        action = Algs.bfs_path(head, state["food"], body_no_tail, state["w"], state["h"])
-
-        # System 2: Coasean Pricing (ONLY injection point)
-        risk = StructGate.analyze_risk(state["snake"], state["w"], state["h"])
-        hunger_ratio = min(1.0, state["hunger"] / Config.MAX_STEPS_WITHOUT_FOOD)
-
+    def _effective_threshold(self, hunger_ratio):
         # === ALPHA INJECTION ===
         # alpha = 0.0 -> effective gain = 0 -> threshold stays at base -> panic earlier (more conservative)
         # alpha > 1.0 -> effective gain higher -> threshold grows with hunger -> panic later (more aggressive)
-        effective_gain = Config.RISK_HUNGER_GAIN * self.alpha
-        threshold = Config.RISK_THRESHOLD_BASE + (hunger_ratio * effective_gain)
+        # (effective gain = RISK_HUNGER_GAIN * alpha, fixed in __init__)
+        threshold = self._risk_base + (hunger_ratio * self._effective_gain)
         # =======================
+        return threshold
 
-        if risk >= threshold:
-            # Strict copy of v0.3.2 logic to ensure consistency
-            if not self.in_panic:
-                self.panic_history.append(game.steps_total)  # episode start index
-                self.in_panic = True
-
-            # Escape Strategy (Identical)
-            tail = state["snake"][-1]
-            escape_move = Algs.bfs_path(head, tail, body_no_tail, state["w"], state["h"])
-            if escape_move:
-                action = escape_move
-            else:
-                action = Algs.get_max_reach_move(head, body_no_tail, state["w"], state["h"])
-        else:
-            self.in_panic = False
+    def get_action(self, game: SnakeGame, risk=None):
+        # System 1 / 1.5 / 2 are BaseAgent's; only the threshold is repriced.
+        action = super().get_action(game, risk=risk)
 
         # Metric Tracking (behavioral ratio)
         if self.in_panic:
             self.steps_in_panic += 1
 
-        # System 1.5: Motor Floor (Identical)
-        if not action:
-            action = Algs.get_max_reach_move(head, body_no_tail, state["w"], state["h"])
-
         return action
 
 
 # --- 2) Run the sweep ---
+def _run_alpha(alpha, n_seeds):
+    """
+    All seeds of one alpha, run in lockstep; each game is identical to a
+    standalone SnakeGame(seed) run. Top-level so worker processes can pickle it.
+    """
+    seeds = list(range(Config.SEED_START, Config.SEED_START + n_seeds))
+    env = SnakeBatch(seeds)
+    agents = [SweepAgent(alpha=alpha) for _ in seeds]
+    views = [env.view(i) for i in range(len(seeds))]
+
+    while True:
+        idx = env.active()
+        if len(idx) == 0:
+            break
+        risks = StructGate.analyze_risk_batch(
+            [tuple(env.snakes[i]) for i in idx], env.w, env.h,
+            moments=env.moments(idx),
+        )
+        actions = [
+            agents[i].get_action(views[i], risk=r)
+            for i, r in zip(idx, risks)
+        ]
+        env.step(idx, actions)
+
+    # Column-wise (one list per CSV column) so the frame is built directly.
+    steps = env.steps_total.tolist()
+    return {
+        "alpha": [alpha] * len(seeds),
+        "seed": seeds,
+        "steps": steps,
+        "len": [len(snake) for snake in env.snakes],
+        "panic_ratio": [
+            (agent.steps_in_panic / n) if n > 0 else 0.0
+            for agent, n in zip(agents, steps)
+        ],
+        "death": env.deaths,
+    }
+
+
 def run_clean_sweep():
     print("Starting Snake-SHM v0.3.4 Clean Sweep...")
 
@@ -109,29 +117,17 @@ def run_clean_sweep():
     alphas = [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]
     n_seeds = 30  # keep small & consistent
 
-    results = []
-
-    for alpha in alphas:
-        print(f"  > Testing alpha = {alpha}...")
-
-        for seed in range(Config.SEED_START, Config.SEED_START + n_seeds):
-            game = SnakeGame(seed)
-            agent = SweepAgent(alpha=alpha)
-
-            while not game.done and game.steps_total < Config.MAX_TOTAL_STEPS:
-                action = agent.get_action(game)
-                game.step(action)
-
-            panic_ratio = (agent.steps_in_panic / game.steps_total) if game.steps_total > 0 else 0.0
+    results = {}
 
-            results.append({
-                "alpha": alpha,
-                "seed": seed,
-                "steps": game.steps_total,
-                "len": len(game.snake),
-                "panic_ratio": panic_ratio,
-                "death": game.death,
-            })
+    # Alphas are independent and every game is seeded explicitly, so each
+    # alpha batch runs in a worker process; map() keeps alpha order.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for alpha, cols in zip(
+            alphas, executor.map(_run_alpha, alphas, [n_seeds] * len(alphas))
+        ):
+            print(f"  > alpha = {alpha} done")
+            for name, values in cols.items():
+                results.setdefault(name, []).extend(values)
 
     # --- 3) Save outputs (NO src pollution) ---
     df = pd.DataFrame(results)
@@ -139,14 +135,17 @@ def run_clean_sweep():
     csv_path = os.path.join(DATA_DIR, "snake_clean_sweep.csv")
     df.to_csv(csv_path, index=False)
 
-    # Aggregation for terminal output (consistency check)
-    summary = df.groupby("alpha")[["steps", "panic_ratio", "len"]].mean()
+    # Aggregation for terminal output (consistency check); one groupby pass
+    # also feeds the plot.
+    summary = df.groupby("alpha").agg(
+        {"steps": "mean", "panic_ratio": "mean", "len": "mean"}
+    )
     print("\n=== SWEEP RESULTS (Mean over seeds) ===")
     print(summary)
 
     # Frontier plot (minimal, no extra semantics)
-    mean_panic = df.groupby("alpha")["panic_ratio"].mean()
-    mean_steps = df.groupby("alpha")["steps"].mean()
+    mean_panic = summary["panic_ratio"]
+    mean_steps = summary["steps"]
 
     plt.figure(figsize=(8, 5))
     plt.scatter(mean_panic, mean_steps)
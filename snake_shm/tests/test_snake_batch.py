@@ -0,0 +1,56 @@
+"""
+SnakeBatch must reproduce standalone SnakeGame runs exactly: the sweep in
+v0.3.4 relies on it when it steps all seeds of an alpha in lockstep.
+"""
+
+import os
+import sys
+import unittest
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from snake_shm_v0_3_2 import BaseAgent, Config, SnakeBatch, SnakeGame
+
+
+class SnakeBatchMatchesSnakeGame(unittest.TestCase):
+    SEEDS = [1000, 1001, 1002]
+
+    def test_trajectories_match(self):
+        batch = SnakeBatch(self.SEEDS)
+        games = [SnakeGame(seed) for seed in self.SEEDS]
+        agents = [BaseAgent() for _ in self.SEEDS]
+        views = [batch.view(i) for i in range(len(self.SEEDS))]
+
+        while True:
+            active = batch.active()
+            idx = active.tolist()
+            expected = [
+                i for i, g in enumerate(games)
+                if not g.done and g.steps_total < Config.MAX_TOTAL_STEPS
+            ]
+            self.assertEqual(idx, expected)
+            if not idx:
+                break
+
+            # Both sides take the same action, chosen on the standalone game.
+            actions = [agents[i].get_action(games[i]) for i in idx]
+            for i, action in zip(idx, actions):
+                games[i].step(action)
+            batch.step(active, actions)
+
+            for i in idx:
+                game, view = games[i], views[i]
+                self.assertEqual(tuple(view.snake), tuple(game.snake))
+                self.assertEqual(view.food, game.food)
+                self.assertEqual(view.steps_since_food, game.steps_since_food)
+                self.assertEqual(view.steps_total, game.steps_total)
+
+        self.assertEqual(batch.deaths, [g.death for g in games])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+The closed-form geometric risk must agree with the SVD definition it
+replaces: 1 - SVD_ENTROPY_SCALE * s2 / s1 on the centered body, clipped.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from snake_shm_v0_3_2 import BodyMoments, Config, StructGate
+
+
+def svd_geom_risk(body):
+    pts = np.array(body, dtype=float)
+    pts -= pts.mean(axis=0)
+    s = np.linalg.svd(pts, compute_uv=False)
+    entropy = s[1] / (s[0] + 1e-8)
+    return np.clip(1.0 - entropy * Config.SVD_ENTROPY_SCALE, 0.0, 1.0)
+
+
+MOVES = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+def random_walk_body(rng, length, w, h, keep=0.9):
+    """
+    A self-avoiding walk of up to `length` distinct cells, head first. It
+    keeps its heading with probability `keep`, so some bodies are thin
+    enough that the geometric risk is not clipped to 0.
+    """
+    body = [(rng.randrange(w), rng.randrange(h))]
+    cells = set(body)
+    heading = rng.randrange(4)
+    while len(body) < length:
+        x, y = body[-1]
+        open_moves = [
+            k for k, (dx, dy) in enumerate(MOVES)
+            if 0 <= x + dx < w and 0 <= y + dy < h
+            and (x + dx, y + dy) not in cells
+        ]
+        if not open_moves:
+            break
+        if heading not in open_moves or rng.random() >= keep:
+            heading = rng.choice(open_moves)
+        dx, dy = MOVES[heading]
+        body.append((x + dx, y + dy))
+        cells.add(body[-1])
+    return body
+
+
+class GeomRiskMatchesSVD(unittest.TestCase):
+    def test_random_bodies(self):
+        rng = random.Random(0)
+        unclipped = 0
+        for _ in range(500):
+            body = random_walk_body(
+                rng, rng.randrange(3, 40), Config.GRID_W, Config.GRID_H
+            )
+            m = BodyMoments()
+            m.reset(body)
+            got = StructGate.geom_risk_from_moments(
+                m.n, m.sx, m.sy, m.sxx, m.syy, m.sxy
+            )
+            want = svd_geom_risk(body)
+            self.assertAlmostEqual(got, want, places=9)
+            unclipped += 0.0 < want < 1.0
+        self.assertGreater(unclipped, 50)  # not just the clipped ends
+
+    def test_straight_body(self):
+        body = [(x, 5) for x in range(10)]
+        m = BodyMoments()
+        m.reset(body)
+        got = StructGate.geom_risk_from_moments(
+            m.n, m.sx, m.sy, m.sxx, m.syy, m.sxy
+        )
+        self.assertEqual(got, 1.0)
+        self.assertEqual(svd_geom_risk(body), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,9 +10,10 @@ Only difference: α scales marginal price of risk.
 α ∈ {0.2, 0.5, 0.8}
 """
 
-import random
+import os
 import numpy as np
 from collections import deque, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 # ============================================================
 # Config
@@ -42,6 +43,12 @@ LPI_RHO = 0.75
 
 ALPHAS = [0.0, 0.5, 1.0, 2.0, 4.0]
 
+# Actions are move indices into these tables; names are for display only.
+UP, DOWN, LEFT, RIGHT = range(4)
+MOVES = ("UP", "DOWN", "LEFT", "RIGHT")
+MOVES_DX = (0, 0, -1, 1)
+MOVES_DY = (-1, 1, 0, 0)
+
 
 # ============================================================
 # Environment
@@ -49,26 +56,35 @@ ALPHAS = [0.0, 0.5, 1.0, 2.0, 4.0]
 
 class VacuumWorld:
     def __init__(self, seed):
-        random.seed(seed)
-        self.grid = np.zeros((GRID_W, GRID_H), dtype=int)
-        for x in range(GRID_W):
-            for y in range(GRID_H):
-                if random.random() < OBSTACLE_DENSITY:
-                    self.grid[x, y] = 1
+        # Legacy MT19937 seeded with [seed] yields the same stream as
+        # random.seed(seed), so grids and action draws match the original
+        # per-cell random.random() / random.choice() code, drawn in bulk.
+        self.rng = np.random.RandomState([seed])
+        self.grid = (
+            self.rng.random_sample((GRID_W, GRID_H)) < OBSTACLE_DENSITY
+        ).astype(np.int8)
         self.grid[0, 0] = 0
+        self._moves = np.empty(0, dtype=np.uint32)
+        self._move_i = 0
         self.pos = (0, 0)
         self.battery = BAT_MAX
         self.steps = 0
 
+    def random_move(self):
+        """Uniform move index, in the order random.choice(MOVES) draws them."""
+        if self._move_i == len(self._moves):
+            # random.choice over 4 items takes the top 3 bits of a 32-bit
+            # draw and rejects values >= 4; pre-roll a block the same way.
+            r = self.rng.randint(0, 2**32, size=MAX_STEPS, dtype=np.uint32) >> 29
+            self._moves = r[r < 4]
+            self._move_i = 0
+        k = int(self._moves[self._move_i])
+        self._move_i += 1
+        return k
+
     def step(self, action):
         x, y = self.pos
-        dx, dy = 0, 0
-        if action == "UP": dy = -1
-        if action == "DOWN": dy = 1
-        if action == "LEFT": dx = -1
-        if action == "RIGHT": dx = 1
-
-        nx, ny = x + dx, y + dy
+        nx, ny = x + MOVES_DX[action], y + MOVES_DY[action]
         if 0 <= nx < GRID_W and 0 <= ny < GRID_H and self.grid[nx, ny] == 0:
             self.pos = (nx, ny)
 
@@ -173,38 +189,47 @@ class CoaseAgent:
 
         # actions
         if self.mode == "NORMAL":
-            return random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+            return world.random_move()
         if self.mode == "SURVIVAL":
-            return "LEFT"
-        return random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+            return LEFT
+        return world.random_move()
 
 
 # ============================================================
 # Experiment
 # ============================================================
 
-def run_alpha(alpha):
-    steps = []
-    useful = []
-    panic = []
-    saved = []
-
-    for i in range(N_SEEDS):
-        seed = SEED_START + i
-        world = VacuumWorld(seed)
-        agent = CoaseAgent(alpha)
-
-        useful_steps = 0
-        while not world.done():
-            act = agent.choose(world)
-            world.step(act)
-            if agent.mode == "NORMAL":
-                useful_steps += 1
-
-        steps.append(world.steps)
-        useful.append(useful_steps / max(1, world.steps))
-        panic.append(agent.panic_events)
-        saved.append(agent.panic_saved)
+def _run_seed(alpha, seed):
+    """One seeded episode; top-level so worker processes can pickle it."""
+    world = VacuumWorld(seed)
+    agent = CoaseAgent(alpha)
+
+    useful_steps = 0
+    while not world.done():
+        act = agent.choose(world)
+        world.step(act)
+        if agent.mode == "NORMAL":
+            useful_steps += 1
+
+    return (
+        world.steps,
+        useful_steps / max(1, world.steps),
+        agent.panic_events,
+        agent.panic_saved,
+    )
+
+
+def run_alpha(alpha, executor=None):
+    # Seeds are independent and each world seeds itself, so they may be
+    # dispatched to an executor; map() keeps seed order either way.
+    seeds = [SEED_START + i for i in range(N_SEEDS)]
+    mapper = executor.map if executor is not None else map
+    runs = list(mapper(_run_seed, [alpha] * N_SEEDS, seeds))
+
+    steps = [r[0] for r in runs]
+    useful = [r[1] for r in runs]
+    panic = [r[2] for r in runs]
+    saved = [r[3] for r in runs]
 
     return {
         "steps": np.mean(steps),
@@ -221,12 +246,13 @@ def run_alpha(alpha):
 if __name__ == "__main__":
     print("\n=== Vacuum-X Coase Frontier v0.4 ===\n")
 
-    for a in ALPHAS:
-        r = run_alpha(a)
-        print(
-            f"α={a:.1f} | "
-            f"AvgSteps={r['steps']:.1f} | "
-            f"UsefulRatio={r['useful']:.3f} | "
-            f"PanicAvg={r['panic']:.1f} | "
-            f"RescueRate={r['save_rate']:.3f}"
-        )
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for a in ALPHAS:
+            r = run_alpha(a, executor)
+            print(
+                f"α={a:.1f} | "
+                f"AvgSteps={r['steps']:.1f} | "
+                f"UsefulRatio={r['useful']:.3f} | "
+                f"PanicAvg={r['panic']:.1f} | "
+                f"RescueRate={r['save_rate']:.3f}"
+            )
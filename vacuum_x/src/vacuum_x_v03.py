@@ -20,8 +20,11 @@ Author intent:
 - Engineering demo showing "dynamic trade-off suppresses Goodhart-like trap"
 """
 
+import math
+import os
 import random
 from collections import deque, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 
 
@@ -70,20 +73,20 @@ class Cfg:
 # ---------------------------
 # 1) Grid world
 # ---------------------------
-ACTIONS = ["UP", "DOWN", "LEFT", "RIGHT", "STAY"]
-DIRS = {
-    "UP": (0, -1),
-    "DOWN": (0, 1),
-    "LEFT": (-1, 0),
-    "RIGHT": (1, 0),
-    "STAY": (0, 0),
-}
+# Actions are ints indexing these tables; names are for display only.
+UP, DOWN, LEFT, RIGHT, STAY = range(5)
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT", "STAY")
+DX = (0, 0, -1, 1, 0)
+DY = (-1, 1, 0, 0, 0)
+MOVES = (UP, DOWN, LEFT, RIGHT)  # STAY excluded
 
 
 class VacuumWorld:
     def __init__(self, seed: int):
-        random.seed(seed)
-        np.random.seed(seed)
+        # Private RNG per world (never the global one): random.Random(seed)
+        # draws exactly what random.seed(seed) did, and parallel or
+        # interleaved worlds cannot disturb each other.
+        self.rng = random.Random(seed)
         self.w = Cfg.W
         self.h = Cfg.H
         self.grid = np.zeros((self.w, self.h), dtype=np.int8)  # 0 free, 1 obstacle
@@ -92,12 +95,16 @@ class VacuumWorld:
         self.dock = (0, 0)
 
         # place obstacles
+        # Sequential rejection sampling is kept on purpose: the draw order
+        # defines every committed grid and the RNG state the agents
+        # inherit. A bulk decode of the same MT words reproduces it exactly
+        # but measured slower at this grid size (~100 draws per world).
         n_cells = self.w * self.h
         n_obs = int(n_cells * Cfg.OBSTACLE_DENSITY)
         placed = 0
         while placed < n_obs:
-            x = random.randrange(self.w)
-            y = random.randrange(self.h)
+            x = self.rng.randrange(self.w)
+            y = self.rng.randrange(self.h)
             if (x, y) == self.dock:
                 continue
             if self.grid[x, y] == 0:
@@ -106,37 +113,55 @@ class VacuumWorld:
 
         # spawn agent
         while True:
-            x = random.randrange(self.w)
-            y = random.randrange(self.h)
+            x = self.rng.randrange(self.w)
+            y = self.rng.randrange(self.h)
             if self.grid[x, y] == 0 and (x, y) != self.dock:
-                self.pos = (x, y)
+                self.x, self.y = x, y
                 break
 
         self.battery = Cfg.BATTERY_MAX
         self.steps = 0
         self.recharge_cycles = 0
 
-    def in_bounds(self, p):
-        x, y = p
-        return 0 <= x < self.w and 0 <= y < self.h
+        # The grid is static for the episode: free-cell flags padded with a
+        # blocked border ring (index (x + 1) * (h + 2) + y + 1), so a cell
+        # one step off the grid tests as blocked without a bounds check; a
+        # reusable visited buffer on the same layout (all-False between
+        # searches); memoized reach counts, escape choices and homing
+        # candidates.
+        pad = np.ones((self.w + 2, self.h + 2), dtype=np.int8)
+        pad[1:-1, 1:-1] = self.grid
+        self._free_pad = (pad.ravel() == 0).tolist()
+        self._pad_stride = self.h + 2
+        self._vis_buf = [False] * len(self._free_pad)
+        self._reach_cache = {}
+        self._escape_cache = {}
+        self._dock_cache = {}
 
     def is_free(self, p):
         x, y = p
-        return self.in_bounds(p) and self.grid[x, y] == 0
+        if -1 <= x <= self.w and -1 <= y <= self.h:
+            return self._free_pad[(x + 1) * self._pad_stride + y + 1]
+        return False
+
+    @property
+    def pos(self):
+        return (self.x, self.y)
 
-    def step(self, action: str):
+    def step(self, action: int):
+        """Apply one action; returns (x, y, battery, moved, done)."""
         self.steps += 1
-        x, y = self.pos
-        dx, dy = DIRS[action]
-        np_ = (x + dx, y + dy)
+        # One step off the grid at most, which the padded table covers.
+        nx = self.x + DX[action]
+        ny = self.y + DY[action]
 
         moved = False
-        if self.is_free(np_):
-            self.pos = np_
-            moved = (np_ != (x, y))
+        if self._free_pad[(nx + 1) * self._pad_stride + ny + 1]:
+            moved = action != STAY
+            self.x, self.y = nx, ny
 
         # battery
-        if self.pos == self.dock:
+        if self.x == self.dock[0] and self.y == self.dock[1]:
             if self.battery < Cfg.BATTERY_MAX:
                 self.recharge_cycles += 1
             self.battery = Cfg.BATTERY_MAX
@@ -144,13 +169,7 @@ class VacuumWorld:
             self.battery -= 1
 
         done = self.battery <= 0
-        return {
-            "pos": self.pos,
-            "battery": self.battery,
-            "dock": self.dock,
-            "moved": moved,
-            "done": done,
-        }
+        return self.x, self.y, self.battery, moved, done
 
 
 # ---------------------------
@@ -158,32 +177,52 @@ class VacuumWorld:
 # ---------------------------
 def local_reachable_count(world: VacuumWorld, start, max_expand=Cfg.LOCAL_REACH_DEPTH):
     """Tiny BFS to estimate how much free space head can reach (budgeted)."""
-    q = deque([start])
-    vis = {start}
+    key = (start, max_expand)
+    cached = world._reach_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Plain Python on purpose: with the cache only ~200 searches miss in a
+    # full run (a few ms), less than importing numba would cost.
+    # On the padded layout the border ring is never free, so the four
+    # neighbors need no bounds tests.
+    free = world._free_pad
+    vis = world._vis_buf
+    stride = world._pad_stride
+    s = (start[0] + 1) * stride + start[1] + 1
+    q = deque([s])
+    vis[s] = True
+    touched = [s]
     expanded = 0
     while q and expanded < max_expand:
-        p = q.popleft()
+        c = q.popleft()
         expanded += 1
-        x, y = p
-        for a in ["UP", "DOWN", "LEFT", "RIGHT"]:
-            dx, dy = DIRS[a]
-            np_ = (x + dx, y + dy)
-            if np_ in vis:
-                continue
-            if world.is_free(np_):
-                vis.add(np_)
-                q.append(np_)
-    return len(vis)
+        # UP, DOWN, LEFT, RIGHT, in action order
+        for n in (c - 1, c + 1, c - stride, c + stride):
+            if free[n] and not vis[n]:
+                vis[n] = True
+                touched.append(n)
+                q.append(n)
+
+    for c in touched:
+        vis[c] = False
+    world._reach_cache[key] = len(touched)
+    return len(touched)
 
 
 def choose_escape_action(world: VacuumWorld):
     """Enhanced escape: pick action maximizing local reachable free space."""
+    # The choice depends only on the position (the grid is static), so it
+    # is scored once per cell and reused for the rest of the episode.
+    x, y = pos = world.x, world.y
+    cached = world._escape_cache.get(pos)
+    if cached is not None:
+        return cached
+
     best = None
     best_score = -1
-    for a in ["UP", "DOWN", "LEFT", "RIGHT"]:
-        x, y = world.pos
-        dx, dy = DIRS[a]
-        np_ = (x + dx, y + dy)
+    for a in MOVES:
+        np_ = (x + DX[a], y + DY[a])
         if not world.is_free(np_):
             continue
         score = local_reachable_count(world, np_)
@@ -192,31 +231,42 @@ def choose_escape_action(world: VacuumWorld):
             best = a
     if best is None:
         # if boxed, allow STAY (will be counted as stuck)
-        return "STAY"
+        best = STAY
+    world._escape_cache[pos] = best
     return best
 
 
 def greedy_to_dock_action(world: VacuumWorld):
     """Simple homing (no global planning): move towards dock greedily."""
-    px, py = world.pos
-    tx, ty = world.dock
-    cand = []
-    if tx > px:
-        cand.append("RIGHT")
-    if tx < px:
-        cand.append("LEFT")
-    if ty > py:
-        cand.append("DOWN")
-    if ty < py:
-        cand.append("UP")
-    random.shuffle(cand)
+    # Candidates toward the dock, and which of them are free, depend only on
+    # the cell; they are built once per cell. The shuffle and fallback
+    # still draw from the RNG on every call, exactly as before.
+    pos = (world.x, world.y)
+    entry = world._dock_cache.get(pos)
+    if entry is None:
+        px, py = pos
+        tx, ty = world.dock
+        cand = []
+        if tx > px:
+            cand.append(RIGHT)
+        if tx < px:
+            cand.append(LEFT)
+        if ty > py:
+            cand.append(DOWN)
+        if ty < py:
+            cand.append(UP)
+        free = [a for a in cand if world.is_free((px + DX[a], py + DY[a]))]
+        entry = world._dock_cache[pos] = (cand, free)
+
+    cand, free = entry
+    if len(cand) > 1:
+        cand = cand[:]
+        world.rng.shuffle(cand)
     for a in cand:
-        dx, dy = DIRS[a]
-        np_ = (px + dx, py + dy)
-        if world.is_free(np_):
+        if a in free:
             return a
     # fallback
-    return random.choice(["UP", "DOWN", "LEFT", "RIGHT", "STAY"])
+    return world.rng.choice((UP, DOWN, LEFT, RIGHT, STAY))
 
 
 # ---------------------------
@@ -224,26 +274,56 @@ def greedy_to_dock_action(world: VacuumWorld):
 # ---------------------------
 class StructGate:
     def __init__(self, window=Cfg.SVD_WINDOW):
-        self.hist = deque(maxlen=window)
-
-    def update(self, pos):
-        self.hist.append(pos)
+        # Window of positions as two int rings (slot i is overwritten once
+        # the window is full) plus running coordinate moments, updated in
+        # O(1) as points enter and leave. Integer sums stay exact (no drift).
+        self.window = window
+        self.xs = [0] * window
+        self.ys = [0] * window
+        self.i = 0
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.syy = self.sxy = 0
+
+    def update(self, x, y):
+        i = self.i
+        if self.n == self.window:
+            ox, oy = self.xs[i], self.ys[i]  # falls out of the window
+            self.sx -= ox
+            self.sy -= oy
+            self.sxx -= ox * ox
+            self.syy -= oy * oy
+            self.sxy -= ox * oy
+        else:
+            self.n += 1
+        self.xs[i] = x
+        self.ys[i] = y
+        self.i = (i + 1) % self.window
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.syy += y * y
+        self.sxy += x * y
 
     def panic(self):
-        if len(self.hist) < self.hist.maxlen:
-            return 0.0
-        pts = np.array(self.hist, dtype=float)
-        pts = pts - pts.mean(axis=0, keepdims=True)
-        try:
-            _, s, _ = np.linalg.svd(pts, full_matrices=False)
-            if len(s) < 2:
-                return 0.0
-            entropy = s[1] / (s[0] + 1e-6)  # in [0,1] roughly
-            # map: low entropy => high panic
-            p = 1.0 - min(entropy * Cfg.SVD_GAIN, 1.0)
-            return float(np.clip(p, 0.0, 1.0))
-        except Exception:
+        if self.n < self.window:
             return 0.0
+        # Singular values only: s^2 are the eigenvalues of the centered 2x2
+        # scatter matrix, here n times over from the running sums, in closed
+        # form (no LAPACK call). The small one is taken as det / lam1, which
+        # stays accurate for straight runs.
+        n = self.n
+        a = n * self.sxx - self.sx * self.sx
+        d = n * self.syy - self.sy * self.sy
+        b = n * self.sxy - self.sx * self.sy
+        lam1 = ((a + d) + math.sqrt((a - d) ** 2 + 4 * b * b)) / 2.0
+        if lam1 <= 0.0:  # no movement in the window
+            entropy = 0.0
+        else:
+            lam2 = max(a * d - b * b, 0) / lam1
+            entropy = math.sqrt(lam2 / n) / (math.sqrt(lam1 / n) + 1e-6)  # in [0,1] roughly
+        # map: low entropy => high panic
+        # entropy >= 0, so p is already in [0, 1]; no clip needed
+        return 1.0 - min(entropy * Cfg.SVD_GAIN, 1.0)
 
 
 # ---------------------------
@@ -261,7 +341,7 @@ class LPIMonitor:
         if is_safe:
             delta_H += Cfg.RECOVERY_GAIN
 
-        self.H = float(np.clip(self.H + delta_H, 0.0, 1.0))
+        self.H = max(min(self.H + delta_H, 1.0), 0.0)  # scalar clip
 
         # only damage counts into stress
         damage = max(0.0, H_prev - self.H)
@@ -284,12 +364,12 @@ class AgentA_Baseline:
     def __init__(self):
         self.mode = "NORMAL"
 
-    def act(self, world: VacuumWorld, _state_cache=None):
+    def act(self, world: VacuumWorld, t: int):
         if world.battery < Cfg.LOW_BAT_BASE:
             self.mode = "SURVIVAL"
             return greedy_to_dock_action(world), {"mode": self.mode}
         self.mode = "NORMAL"
-        return random.choice(["UP", "DOWN", "LEFT", "RIGHT"]), {"mode": self.mode}
+        return world.rng.choice(MOVES), {"mode": self.mode}
 
 
 class AgentB_StructGate:
@@ -323,22 +403,26 @@ class AgentB_StructGate:
         # “饥饿/资源压力”直接提高风险容忍度（更敢冒险），但 LPI（受损）让它更保守
         battery_pressure = (1.0 - bat_ratio)  # 0..1
         panic_th = Cfg.PANIC_TH_BASE - (lpi * Cfg.HUNGER_GAIN_PANIC) - (Cfg.BAT_PRESSURE_GAIN * battery_pressure)
-        panic_th = float(np.clip(panic_th, 0.20, 0.95))
+        panic_th = max(min(panic_th, 0.95), 0.20)  # scalar clip, no NumPy round-trip
 
         bat_th = Cfg.LOW_BAT_BASE + (lpi * Cfg.HUNGER_GAIN_BAT)
-        bat_th = float(np.clip(bat_th, 5.0, Cfg.BATTERY_MAX - 1))
+        bat_th = float(max(min(bat_th, Cfg.BATTERY_MAX - 1), 5.0))
         return panic_th, bat_th
 
-    def act(self, world: VacuumWorld, state_cache: dict):
+    def act(self, world: VacuumWorld, t: int):
         # update monitors
-        self.gate.update(world.pos)
+        # (Kept as plain method calls: a fused @njit core measured ~0.8 us
+        # per step, but importing numba and loading its cache costs ~0.3 s,
+        # about what this whole monitor path costs once its scalar math
+        # avoids NumPy.)
+        pos = world.pos
+        self.gate.update(world.x, world.y)
         d_t = self.gate.panic()
-        lpi, H, dmg = self.mon.update(d_t, is_safe=(world.pos == world.dock))
+        lpi, H, dmg = self.mon.update(d_t, is_safe=(pos == world.dock))
 
         panic_th, bat_th = self._dynamic_thresholds(lpi, world.battery)
 
         # rescue window update: after some steps, decide success
-        t = state_cache["t"]
         if self.pending_rescue is not None:
             if t - self.pending_rescue["t"] >= Cfg.RESCUE_WINDOW:
                 # success if risk meaningfully dropped OR agent moved out of stuck loop
@@ -369,7 +453,7 @@ class AgentB_StructGate:
 
             # start rescue accounting
             self.panic_events += 1
-            self.pending_rescue = {"t": t, "start_risk": d_t, "start_pos": world.pos}
+            self.pending_rescue = {"t": t, "start_risk": d_t, "start_pos": pos}
 
         if self.mode == "ESCAPE":
             if self.escape_timer <= 0:
@@ -385,7 +469,7 @@ class AgentB_StructGate:
             self.escape_timer -= 1
         else:
             # Normal: mild exploration but avoid STAY
-            a = random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+            a = world.rng.choice(MOVES)
 
         info = {
             "mode": self.mode,
@@ -409,24 +493,27 @@ def run_single(agent_type: str, seed: int, max_steps=2000):
         agent = AgentB_StructGate()
 
     # productivity proxy: moved ratio and stuck time
-    moved_hist = deque(maxlen=Cfg.STUCK_WINDOW)
+    # Last STUCK_WINDOW steps all without a move <=> the current run of
+    # no-moves is at least that long, so a run counter replaces the window.
+    still_run = 0
     deadlock_steps = 0
     useful_moves = 0
 
     for t in range(max_steps):
-        state_cache = {"t": t}
-        a, info = agent.act(world, state_cache)
-        res = world.step(a)
+        a, info = agent.act(world, t)
+        _, _, _, moved, done = world.step(a)
 
-        moved_hist.append(1 if res["moved"] else 0)
-        if res["moved"]:
+        if moved:
             useful_moves += 1
+            still_run = 0
+        else:
+            still_run += 1
 
         # deadlock proxy: too many no-moves in window
-        if len(moved_hist) == moved_hist.maxlen and sum(moved_hist) == 0:
+        if still_run >= Cfg.STUCK_WINDOW:
             deadlock_steps += 1
 
-        if res["done"]:
+        if done:
             break
 
     out = {
@@ -489,8 +576,15 @@ def run_experiment():
 
     seeds = list(range(Cfg.SEED_START, Cfg.SEED_START + Cfg.N_SEEDS))
 
-    A = [run_single("A", s) for s in seeds]
-    B = [run_single("B", s) for s in seeds]
+    # Runs are independent and each world owns an RNG seeded from its seed,
+    # so they go to worker processes; map() keeps seed order.
+    # Not stepped as one lockstep NumPy batch: episodes average ~760 steps
+    # but the batch would tick to the longest (2000), and the per-tick
+    # array ops for world + monitor (~60 at ~0.5 us on (50,) vectors) cost
+    # about what the whole per-seed Python loop does now.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        A = list(executor.map(run_single, ["A"] * len(seeds), seeds))
+        B = list(executor.map(run_single, ["B"] * len(seeds), seeds))
 
     sa = summarize(A)
     sb = summarize(B)